@@ -5,12 +5,31 @@ import sys
 import os
 import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from pipeline import ContextifyPipeline
 from graph_builder import GraphBuilder
 
+def write_json(path, data):
+    """Write data as indented UTF-8 JSON, using orjson when it is installed.
+
+    Both paths write non-ASCII as raw UTF-8 and coerce non-str keys to strings,
+    so the output is equivalent JSON. It is not byte-identical: float formatting
+    can differ (orjson writes 1e20 where json writes 1e+20).
+    """
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
 def create_mock_rlm_results():
     """Create mock RLM analysis results for demo_repo with realistic issues."""
     return {
@@ -130,8 +149,7 @@ def main():
         "stats": stats
     }
 
-    with open(graph_file, 'w') as f:
-        json.dump(graph_data, f, indent=2)
+    write_json(graph_file, graph_data)
 
     print(f"[OK] Graph saved to: {graph_file}")
 
@@ -145,15 +163,13 @@ def main():
     os.makedirs(analysis_dir, exist_ok=True)
 
     detailed_file = os.path.join(analysis_dir, "detailed_analysis.json")
-    with open(detailed_file, 'w') as f:
-        json.dump(rlm_results, f, indent=2)
+    write_json(detailed_file, rlm_results)
 
     print(f"[OK] RLM results saved to: {detailed_file}")
 
     # Save summary
     summary_file = os.path.join(analysis_dir, "summary.json")
-    with open(summary_file, 'w') as f:
-        json.dump(rlm_results['summary'], f, indent=2)
+    write_json(summary_file, rlm_results['summary'])
 
     print(f"[OK] Summary saved to: {summary_file}")
 
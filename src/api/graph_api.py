@@ -8,6 +8,7 @@ Provides functions to load graphs, query nodes/edges, and serialize for web cons
 import pickle
 import json
 import networkx as nx
+import numpy as np
 from pathlib import Path
 from typing import Optional, Any
 from dataclasses import dataclass, asdict
@@ -38,6 +39,13 @@ class EdgeInfo:
         return asdict(self)
 
 
+def _unpack_strings(data: np.ndarray, offsets: np.ndarray) -> list[str]:
+    """Decode strings stored as a UTF-8 byte buffer plus offsets."""
+    buf = data.tobytes()
+    bounds = offsets.tolist()
+    return [buf[a:b].decode("utf-8") for a, b in zip(bounds, bounds[1:])]
+
+
 class GraphAPI:
     """
     Python API for accessing RepoGraph data.
@@ -65,10 +73,12 @@ class GraphAPI:
         """
         self.output_dir = Path(repo_output_dir)
         self.graph_path = self.output_dir / "graph.pkl"
+        self.arrays_path = self.output_dir / "graph.npz"
         self.tags_path = self.output_dir / "tags.json"
         self.graph: Optional[nx.MultiDiGraph] = None
         self.tags: list[dict] = []
         self._node_index: dict[str, dict] = {}
+        self._file_view: Optional[tuple[list[NodeInfo], dict[str, int], list[EdgeInfo]]] = None
 
     def load(self) -> "GraphAPI":
         """Load the graph and tags from disk."""
@@ -79,6 +89,9 @@ class GraphAPI:
         with open(self.graph_path, "rb") as f:
             self.graph = pickle.load(f)
 
+        # Load the columnar file-level view, if one was saved
+        self._file_view = self._load_file_view()
+
         # Load tags
         self.tags = []
         if self.tags_path.exists():
@@ -298,6 +311,35 @@ class GraphAPI:
             }
         }
 
+    def _load_file_view(self) -> Optional[tuple[list[NodeInfo], dict[str, int], list[EdgeInfo]]]:
+        """
+        Load the file-only view from graph.npz.
+
+        Returns:
+            Tuple of (file nodes, out-degree by node id, file-to-file edges),
+            or None if no columnar graph was saved for this repo.
+        """
+        if not self.arrays_path.exists():
+            return None
+
+        with np.load(self.arrays_path) as data:
+            # Written by an older version that stored fixed-width string arrays
+            if "id_offsets" not in data.files:
+                return None
+            ids = _unpack_strings(data["ids"], data["id_offsets"])
+            files = _unpack_strings(data["files"], data["file_offsets"])
+            out_degree = data["out_degree"].tolist()
+            src_idx = data["src_idx"].tolist()
+            dst_idx = data["dst_idx"].tolist()
+
+        nodes = [
+            NodeInfo(id=n, name=n, category="file", kind="def", file=f, line=[0, 0], info="")
+            for n, f in zip(ids, files)
+        ]
+        degrees = dict(zip(ids, out_degree))
+        edges = [EdgeInfo(source=ids[u], target=ids[v]) for u, v in zip(src_idx, dst_idx)]
+        return nodes, degrees, edges
+
     def to_vis_format(self, files_only: bool = False) -> dict:
         """
         Export graph in format suitable for the React frontend visualization.
@@ -316,7 +358,10 @@ class GraphAPI:
             raise RuntimeError("Graph not loaded. Call load() first.")
 
         # Get nodes based on mode
-        if files_only:
+        file_view = self._file_view if files_only else None
+        if file_view is not None:
+            all_nodes, out_degrees, edges = file_view
+        elif files_only:
             # Get file nodes directly from graph (not from tags)
             all_nodes = []
             for node_id, attrs in self.graph.nodes(data=True):
@@ -333,7 +378,9 @@ class GraphAPI:
         else:
             all_nodes = self.get_definitions()
 
-        edges = self.get_edges()
+        if file_view is None:
+            edges = self.get_edges()
+            out_degrees = dict(self.graph.out_degree())
 
         # Create node map with unique IDs
         node_map = {}
@@ -379,16 +426,12 @@ class GraphAPI:
                                     break
 
                 # Extract folder from file path
-                path_parts = file_path.split("/")
-                if len(path_parts) > 1:
-                    folder = "/".join(path_parts[:-1])
-                else:
+                folder, sep, _ = file_path.rpartition("/")
+                if not sep:
                     folder = "root"
 
                 # Count outgoing edges for sizing
-                out_degree = 0
-                if node.name in self.graph:
-                    out_degree = self.graph.out_degree(node.name)
+                out_degree = out_degrees.get(node.name, 0)
 
                 node_map[node.name] = {
                     "id": node.name,
@@ -450,18 +493,14 @@ class GraphAPI:
                 print(f"Could not load RLM data: {e}")
 
         # Create edges (only for nodes that exist)
-        edge_list = []
-        seen_edges = set()
-        for edge in edges:
-            if edge.source in node_map and edge.target in node_map:
-                # Make DAG - remove bidirectional edges
-                edge_pair = tuple(sorted([edge.source, edge.target]))
-                if edge_pair not in seen_edges:
-                    seen_edges.add(edge_pair)
-                    edge_list.append({
-                        "from": edge.source,
-                        "to": edge.target,
-                    })
+        in_map = node_map.__contains__
+        pairs = [(e.source, e.target) for e in edges if in_map(e.source) and in_map(e.target)]
+
+        # Make DAG - remove bidirectional edges (first direction seen wins)
+        unique_pairs = {}
+        for u, v in pairs:
+            unique_pairs.setdefault((u, v) if u < v else (v, u), (u, v))
+        edge_list = [{"from": u, "to": v} for u, v in unique_pairs.values()]
 
         return {
             "nodes": nodes,
@@ -12,9 +12,11 @@ import re
 import sys
 from pathlib import Path
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, asdict
 from typing import Optional
 import networkx as nx
+import numpy as np
 
 
 # Supported file extensions and their language mappings
@@ -67,6 +69,10 @@ LANGUAGE_EXTENSIONS = {
     ".xml": "xml",
 }
 
+# Max concurrent file reads (also the batch size, which bounds how many
+# file texts are held in memory at once)
+READ_WORKERS = 64
+
 # Regex patterns for extracting definitions by language
 DEFINITION_PATTERNS = {
     "python": {
@@ -174,6 +180,14 @@ IMPORT_PATTERNS = {
 }
 
 
+def pack_strings(strings: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    """Encode strings as one UTF-8 byte buffer plus n + 1 offsets into it."""
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(b) for b in encoded])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
 @dataclass
 class CodeNode:
     """Represents a code element (function, class, or file)."""
@@ -220,12 +234,20 @@ class GraphBuilder:
         # Build file map for resolving imports
         file_map = self._build_file_map(all_files)
 
-        # Parse each file
-        for file_path in all_files:
-            self._parse_file(file_path, file_map)
+        # Read files concurrently in bounded batches; parse each one and keep
+        # only its import candidates so file text can be dropped right away
+        imports: dict[Path, list[str]] = {}
+        with ThreadPoolExecutor(max_workers=READ_WORKERS) as ex:
+            for start in range(0, len(all_files), READ_WORKERS):
+                batch = all_files[start:start + READ_WORKERS]
+                for file_path, code in zip(batch, ex.map(self._read_source, batch)):
+                    if code is None:
+                        continue
+                    self._parse_file(file_path, file_map, code)
+                    imports[file_path] = self._extract_imports(file_path, code)
 
         # Build edges from imports
-        self._build_import_edges(all_files, file_map)
+        self._build_import_edges(imports, file_map)
 
         return self.graph
 
@@ -266,20 +288,22 @@ class GraphBuilder:
             file_map[str(rel).replace("\\", "/")] = f
         return file_map
 
+    def _read_source(self, file_path: Path) -> Optional[str]:
+        """Read a source file, returning None if it cannot be read."""
+        try:
+            return file_path.read_text(encoding="utf-8", errors="ignore")
+        except Exception as e:
+            print(f"  Skipping {file_path}: {e}")
+            return None
+
     def _get_language(self, file_path: Path) -> str:
         """Get the language for a file."""
         return LANGUAGE_EXTENSIONS.get(file_path.suffix.lower(), "unknown")
 
-    def _parse_file(self, file_path: Path, file_map: dict):
+    def _parse_file(self, file_path: Path, file_map: dict, code: str):
         """Parse a source file and extract definitions."""
         language = self._get_language(file_path)
 
-        try:
-            code = file_path.read_text(encoding="utf-8", errors="ignore")
-        except Exception as e:
-            print(f"  Skipping {file_path}: {e}")
-            return
-
         rel_path = str(file_path.relative_to(self.repo_path))
         lines = code.splitlines()
 
@@ -420,23 +444,24 @@ class GraphBuilder:
             info=info
         ))
 
-    def _build_import_edges(self, files: list[Path], file_map: dict):
-        """Build edges based on import relationships."""
-        for file_path in files:
-            try:
-                code = file_path.read_text(encoding="utf-8", errors="ignore")
-            except Exception:
-                continue
+    def _extract_imports(self, file_path: Path, code: str) -> list[str]:
+        """Extract raw import targets from a file's source text."""
+        patterns = IMPORT_PATTERNS.get(self._get_language(file_path), [])
+        if not patterns:
+            return []
 
-            language = self._get_language(file_path)
-            from_file = str(file_path.relative_to(self.repo_path)).replace("\\", "/")
-            patterns = IMPORT_PATTERNS.get(language, [])
+        imports = []
+        for line in code.splitlines():
+            for pattern in patterns:
+                imports.extend(re.findall(pattern, line.strip()))
+        return imports
 
-            for line in code.splitlines():
-                for pattern in patterns:
-                    matches = re.findall(pattern, line.strip())
-                    for match in matches:
-                        self._add_import_edge(from_file, match, file_map)
+    def _build_import_edges(self, imports: dict[Path, list[str]], file_map: dict):
+        """Build edges based on import relationships."""
+        for file_path, targets in imports.items():
+            from_file = str(file_path.relative_to(self.repo_path)).replace("\\", "/")
+            for target in targets:
+                self._add_import_edge(from_file, target, file_map)
 
     def _add_import_edge(self, from_file: str, import_path: str, file_map: dict):
         """Add an edge if the import target is in the repo."""
@@ -452,9 +477,9 @@ class GraphBuilder:
         ]
 
         for candidate in candidates:
-            # Check if it matches a file in our map
+            # Check if it matches a file in our map (a suffix match is also a substring match)
             for key, path in file_map.items():
-                if candidate in key or key.endswith(candidate):
+                if candidate in key:
                     to_file = str(path.relative_to(self.repo_path)).replace("\\", "/")
                     if from_file != to_file and from_file in self.graph and to_file in self.graph:
                         self.graph.add_edge(from_file, to_file)
@@ -468,7 +493,11 @@ class GraphBuilder:
         # Save NetworkX graph
         graph_path = output_dir / "graph.pkl"
         with open(graph_path, "wb") as f:
-            pickle.dump(self.graph, f)
+            pickle.dump(self.graph, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        # Save columnar copy of the graph for fast file-level views
+        arrays_path = output_dir / "graph.npz"
+        np.savez(arrays_path, **self.to_arrays())
 
         # Save tags as JSONL
         tags_path = output_dir / "tags.json"
@@ -487,6 +516,31 @@ class GraphBuilder:
 
         return graph_path, tags_path
 
+    def to_arrays(self) -> dict[str, np.ndarray]:
+        """
+        Flatten the file-level graph into parallel arrays.
+
+        Only file nodes are stored: ids and paths as UTF-8 byte buffers with
+        offsets, each file's out-degree in the full graph, and file-to-file
+        edges as integer indices into ``ids``.
+        """
+        file_nodes = [(n, d) for n, d in self.graph.nodes(data=True) if d.get("category") == "file"]
+        index = {n: i for i, (n, _) in enumerate(file_nodes)}
+        file_edges = [(index[u], index[v]) for u, v in self.graph.edges() if u in index and v in index]
+
+        ids, id_offsets = pack_strings([n for n, _ in file_nodes])
+        files, file_offsets = pack_strings([d.get("file", n) for n, d in file_nodes])
+
+        return {
+            "ids": ids,
+            "id_offsets": id_offsets,
+            "files": files,
+            "file_offsets": file_offsets,
+            "out_degree": np.array([self.graph.out_degree(n) for n, _ in file_nodes], dtype=np.int32),
+            "src_idx": np.array([u for u, _ in file_edges], dtype=np.int32),
+            "dst_idx": np.array([v for _, v in file_edges], dtype=np.int32),
+        }
+
     def get_stats(self) -> dict:
         """Get graph statistics."""
         # Count languages
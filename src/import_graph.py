@@ -1,62 +1,358 @@
+# Fully annotated so it can be compiled in place with `mypyc src/import_graph.py`;
+# the resulting extension module is picked up by `import import_graph` unchanged.
 import ast
+import hashlib
+import os
+import pickle
 import sys
+import warnings
 from pathlib import Path
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Iterator, Optional
 
+try:
+    import pathspec
+except ImportError:
+    pathspec = None  # type: ignore[assignment]
 
-def resolve_base(current_mod, module, level):
-    base = module or ""
-    if level > 0:
-        pkg = current_mod.split(".")[:-1]
-        pkg = pkg[: max(0, len(pkg) - (level - 1))]
-        prefix = ".".join(pkg)
-        base = f"{prefix}.{base}".strip(".") if base else prefix
-    return base
+try:
+    from tree_sitter_languages import get_parser  # type: ignore[import-untyped]
+
+    # tree_sitter_languages uses a Language constructor deprecated in tree-sitter
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", FutureWarning)
+        TS_PARSER = get_parser("python")
+except (ImportError, TypeError):
+    # TypeError: tree_sitter_languages installed against an incompatible tree-sitter
+    TS_PARSER = None
+
+try:
+    from mypy_extensions import mypyc_attr
+except ImportError:
+    def mypyc_attr(*attrs, **kwattrs):  # type: ignore[misc]
+        return lambda cls: cls
+
+# Directories never worth parsing (VCS metadata, virtualenvs, build output)
+SKIP_DIRS = {
+    ".git", "__pycache__", ".venv", "venv", "node_modules",
+    ".tox", ".mypy_cache", ".pytest_cache", "build", "dist",
+}
+
+# Statements whose bodies are not scanned for module-level imports
+TS_SKIP_NODES = {"function_definition", "class_definition", "decorated_definition"}
 
+# Below this many files, parsing inline beats the cost of starting a process pool
+POOL_MIN_FILES = 32
 
-def get_imports(py_file, current_mod):
+# Parsed imports are cached across runs only when CONTEXTIFY_IMPORT_CACHE is set
+CACHE_ENV = "CONTEXTIFY_IMPORT_CACHE"
+
+# Bump when the cache layout or import extraction changes; older caches are ignored
+CACHE_VERSION = 1
+
+
+def load_gitignore(root: str):
+    """Return a matcher for root/.gitignore, or None if unavailable."""
+    if pathspec is None:
+        return None
     try:
-        code = py_file.read_text(encoding="utf-8")
-        tree = ast.parse(code)
-    except (SyntaxError, UnicodeDecodeError):
-        return []
+        with open(os.path.join(root, ".gitignore"), encoding="utf-8") as fh:
+            return pathspec.PathSpec.from_lines("gitwildmatch", fh)
+    except OSError:
+        return None
+
+
+def walk_py(root: str) -> Iterator[str]:
+    """Yield paths of .py files under root using os.scandir.
+
+    Directories in SKIP_DIRS are pruned without being opened, as are paths
+    matched by the root .gitignore when pathspec is installed.
+    """
+    ignore = load_gitignore(root)
+    stack = [root]
+    while stack:
+        d = stack.pop()
+        try:
+            entries = os.scandir(d)
+        except OSError:
+            continue
+        with entries:
+            for e in entries:
+                if e.is_dir(follow_symlinks=False):
+                    if e.name in SKIP_DIRS:
+                        continue
+                    if ignore and ignore.match_file(os.path.relpath(e.path, root) + "/"):
+                        continue
+                    stack.append(e.path)
+                elif e.name.endswith(".py") and e.is_file():
+                    if ignore and ignore.match_file(os.path.relpath(e.path, root)):
+                        continue
+                    yield e.path
+
+
+def module_name(path: str, repo: str | Path) -> str:
+    return os.path.relpath(path, repo).removesuffix(".py").replace(os.sep, ".")
+
+
+def resolve_base(current_mod: str, module: Optional[str], level: int, pkg: Optional[list[str]] = None) -> str:
+    # Absolute imports are the common case and need no package arithmetic
+    if not level:
+        return module or ""
 
-    imports = []
+    if pkg is None:
+        pkg = current_mod.split(".")[:-1]
+    pkg = pkg[: max(0, len(pkg) - (level - 1))]
+    prefix = ".".join(pkg)
+    return f"{prefix}.{module}".strip(".") if module else prefix
+
+
+# Kept as a regular Python class when compiled so NodeVisitor dispatch still works
+@mypyc_attr(native_class=False)
+class ImportCollector(ast.NodeVisitor):
+    """Collect module-level imports, skipping function and class bodies."""
+
+    def __init__(self, current_mod: str):
+        self.current_mod = current_mod
+        self.pkg = current_mod.split(".")[:-1]
+        self.imports: list[str] = []
+
+    def visit_Import(self, node: ast.Import) -> None:
+        for a in node.names:
+            self.imports.append(sys.intern(a.name))
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        base = resolve_base(self.current_mod, node.module, node.level or 0, self.pkg)
+        if not base:
+            return
+
+        self.imports.append(sys.intern(base))
+        for a in node.names:
+            if a.name != "*":
+                self.imports.append(sys.intern(f"{base}.{a.name}"))
+
+    # Imports nested in functions or classes are not module-level dependencies
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        pass
+
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:
+        pass
 
-    for n in ast.walk(tree):
-        if isinstance(n, ast.Import):
-            for a in n.names:
-                imports.append(a.name)
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        pass
 
-        elif isinstance(n, ast.ImportFrom):
-            base = resolve_base(current_mod, n.module, n.level or 0)
+
+def _ts_name(node) -> str:
+    if node.type == "aliased_import":
+        node = node.child_by_field_name("name")
+    return node.text.decode()
+
+
+def get_imports_ts(data: bytes, current_mod: str) -> Optional[list[str]]:
+    """
+    Extract module-level imports with tree-sitter, mirroring ImportCollector.
+
+    Returns None if tree-sitter reports a parse error, so the caller can
+    fall back to ast (the bundled grammar can lag behind new syntax).
+    """
+    root = TS_PARSER.parse(data).root_node
+    if root.has_error:
+        return None
+
+    pkg = current_mod.split(".")[:-1]
+    imports: list[str] = []
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if node.type == "import_statement":
+            for n in node.children_by_field_name("name"):
+                imports.append(sys.intern(_ts_name(n)))
+
+        elif node.type in ("import_from_statement", "future_import_statement"):
+            mod = node.child_by_field_name("module_name")
+            module = None
+            level = 0
+            if mod is None:
+                module = "__future__"
+            elif mod.type == "relative_import":
+                for c in mod.children:
+                    if c.type == "import_prefix":
+                        level = len(c.text)
+                    elif c.type == "dotted_name":
+                        module = c.text.decode()
+            else:
+                module = mod.text.decode()
+
+            base = resolve_base(current_mod, module, level, pkg)
             if not base:
                 continue
 
-            imports.append(base)
-            for a in n.names:
-                if a.name != "*":
-                    imports.append(f"{base}.{a.name}")
+            imports.append(sys.intern(base))
+            for n in node.children_by_field_name("name"):
+                imports.append(sys.intern(f"{base}.{_ts_name(n)}"))
+
+        elif node.type not in TS_SKIP_NODES:
+            stack.extend(reversed(node.children))
 
     return imports
 
 
-def build_edges(repo: Path):
-    py_files = list(repo.rglob("*.py"))
+def get_imports(py_file: str | Path, current_mod: str) -> list[str]:
+    try:
+        # Hand raw bytes to the parser; it decodes (honoring coding cookies) itself
+        with open(py_file, "rb") as fh:
+            data = fh.read()
+        if TS_PARSER is not None:
+            ts_imports = get_imports_ts(data, current_mod)
+            if ts_imports is not None:
+                return ts_imports
+        tree = ast.parse(data, filename=str(py_file), type_comments=False)
+    except (SyntaxError, UnicodeDecodeError):
+        return []
+
+    collector = ImportCollector(current_mod)
+    collector.visit(tree)
+    return collector.imports
+
+
+def _parse_one(py_file: str, repo: str | Path) -> tuple[str, list[str]]:
+    rel = module_name(py_file, repo)
+    return rel, get_imports(py_file, rel)
+
+
+def import_cache_path(repo: str | Path) -> Path:
+    """Per-repo cache file under the user cache dir ($XDG_CACHE_HOME or ~/.cache)."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    digest = hashlib.sha1(os.path.abspath(repo).encode("utf-8")).hexdigest()[:16]
+    return Path(base) / "contextify" / f"imports-{digest}.pkl"
+
+
+def import_cache_tag() -> tuple[int, bool]:
+    """Tag stored with the cache; tree-sitter and ast can extract imports differently."""
+    return (CACHE_VERSION, TS_PARSER is not None)
+
+
+def load_import_cache(path: Path) -> Optional[dict]:
+    """
+    Return the on-disk import cache, or None when caching is disabled.
+
+    A missing, unreadable or differently tagged cache loads as empty.
+    """
+    if not os.environ.get(CACHE_ENV):
+        return None
+    try:
+        with open(path, "rb") as f:
+            data = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return {}
+    if not isinstance(data, tuple) or len(data) != 2 or data[0] != import_cache_tag():
+        return {}
+    return data[1]
+
+
+def save_import_cache(cache: dict, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as f:
+        pickle.dump((import_cache_tag(), cache), f, protocol=5)
+
 
-    module_map = {}
+def build_suffix_index(modules: list[str]) -> dict[tuple[str, ...], list[int]]:
+    """Index every dotted suffix of each module name, keyed by reversed parts.
+
+    ``pkg.sub.mod`` is reachable as ``("mod",)``, ``("mod", "sub")`` and
+    ``("mod", "sub", "pkg")``, so resolving an import is a single lookup
+    instead of a scan over every module. Values are indices into modules.
+    """
+    suffix_index: defaultdict[tuple[str, ...], list[int]] = defaultdict(list)
+    for i, mod in enumerate(modules):
+        rev = tuple(reversed(mod.split(".")))
+        for depth in range(1, len(rev) + 1):
+            suffix_index[rev[:depth]].append(i)
+    return suffix_index
+
+
+def resolve_import(imp: str, suffix_index: dict[tuple[str, ...], list[int]]) -> list[int]:
+    return suffix_index.get(tuple(reversed(imp.split("."))), [])
+
+
+def build_edge_index(repo: Path) -> tuple[list[str], set[tuple[int, int]]]:
+    """
+    Build the import graph as (src, dst) index pairs.
+
+    Returns:
+        Tuple of (module names, set of (src_idx, dst_idx) pairs indexing them)
+    """
+    py_files = list(walk_py(str(repo)))
+
+    module_map: dict[str, str] = {}
     for f in py_files:
-        rel = f.relative_to(repo).with_suffix("")
-        module_map[".".join(rel.parts)] = f
+        module_map[sys.intern(module_name(f, repo))] = f
 
-    edges = defaultdict(set)
+    modules = list(module_map)
+    mod_id = {m: i for i, m in enumerate(modules)}
+    suffix_index = build_suffix_index(modules)
+    edge_set: set[tuple[int, int]] = set()
 
+    # Reuse cached imports for files whose mtime and size are unchanged.
+    # Only files seen in this run are carried over, so stale entries drop out.
+    cache_path = import_cache_path(repo)
+    cache = load_import_cache(cache_path)
+    fresh: dict = {}
+    results: list[tuple[str, list[str]]] = []
+    misses: list[str] = []
+    stats: dict[str, tuple[int, int]] = {}
     for f in py_files:
-        rel = ".".join(f.relative_to(repo).with_suffix("").parts)
-        for imp in get_imports(f, rel):
-            for mod in module_map:
-                if imp == mod or mod.endswith(imp):
-                    edges[rel].add(mod)
+        if cache is not None:
+            key = os.path.abspath(f)
+            st = os.stat(f)
+            stats[key] = (st.st_mtime_ns, st.st_size)
+            rel = module_name(f, repo)
+            entry = cache.get(key)
+            if entry and entry[:3] == (*stats[key], rel):
+                fresh[key] = entry
+                results.append(entry[2:])
+                continue
+        misses.append(f)
+
+    # ast.parse is CPU-bound, so fan larger batches out across processes
+    if misses:
+        if len(misses) < POOL_MIN_FILES:
+            parsed = [_parse_one(f, repo) for f in misses]
+        else:
+            with ProcessPoolExecutor() as ex:
+                parsed = list(ex.map(_parse_one, misses, repeat(repo), chunksize=16))
+        results.extend(parsed)
+
+        if cache is not None:
+            for f, (rel, imports) in zip(misses, parsed):
+                key = os.path.abspath(f)
+                fresh[key] = (*stats[key], rel, imports)
+
+    if cache is not None and (misses or len(fresh) != len(cache)):
+        save_import_cache(fresh, cache_path)
+
+    for rel, imports in results:
+        src = mod_id[rel]
+        for imp in imports:
+            for dst in resolve_import(imp, suffix_index):
+                edge_set.add((src, dst))
+
+    return modules, edge_set
+
+
+def build_edges(repo: Path) -> defaultdict[str, set[str]]:
+    modules, edge_set = build_edge_index(repo)
+
+    # Group by source index first, then insert sources in module order so the
+    # output order stays deterministic without sorting every edge pair
+    by_src: dict[int, set[str]] = {}
+    for src, dst in edge_set:
+        by_src.setdefault(src, set()).add(modules[dst])
+
+    edges: defaultdict[str, set[str]] = defaultdict(set)
+    for src in sorted(by_src):
+        edges[modules[src]] = by_src[src]
 
     return edges
 
@@ -1,21 +1,48 @@
 import ast
 import sys
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from import_graph import POOL_MIN_FILES, walk_py
 
 
-def parse_file(py_file: Path):
+class DefinitionCollector(ast.NodeVisitor):
+    """Collect top-level functions and classes without walking their bodies."""
+
+    def __init__(self):
+        self.defs = []
+
+    def visit_FunctionDef(self, node):
+        self.defs.append(("function", node.name))
+
+    def visit_ClassDef(self, node):
+        self.defs.append(("class", node.name))
+
+
+def get_definitions(py_file: str | Path):
     try:
-        code = py_file.read_text(encoding="utf-8")
-        tree = ast.parse(code)
+        # Hand raw bytes to the parser; it decodes (honoring coding cookies) itself
+        with open(py_file, "rb") as fh:
+            data = fh.read()
+        tree = ast.parse(data, filename=str(py_file), type_comments=False)
     except (SyntaxError, UnicodeDecodeError):
+        return None
+
+    collector = DefinitionCollector()
+    collector.visit(tree)
+    return collector.defs
+
+
+def print_definitions(py_file: str | Path, defs):
+    if defs is None:
         return
 
     print(f"\n📄 {py_file}")
-    for node in ast.walk(tree):
-        if isinstance(node, ast.FunctionDef):
-            print("  └─ function:", node.name)
-        elif isinstance(node, ast.ClassDef):
-            print("  └─ class:", node.name)
+    for kind, name in defs:
+        print(f"  └─ {kind}:", name)
+
+
+def parse_file(py_file: str | Path):
+    print_definitions(py_file, get_definitions(py_file))
 
 
 def main():
@@ -23,9 +50,17 @@ def main():
         print("Usage: python src/parse_ast.py <repo_path>")
         return
 
-    repo = Path(sys.argv[1])
-    for file in repo.rglob("*.py"):
-        parse_file(file)
+    files = list(walk_py(sys.argv[1]))
+
+    # Parse larger repos in worker processes, print in the parent to keep output ordered
+    if len(files) < POOL_MIN_FILES:
+        for file in files:
+            print_definitions(file, get_definitions(file))
+        return
+
+    with ProcessPoolExecutor() as ex:
+        for file, defs in zip(files, ex.map(get_definitions, files, chunksize=16)):
+            print_definitions(file, defs)
 
 
 if __name__ == "__main__":
@@ -1,18 +1,49 @@
+import os
 import sys
 from pathlib import Path
 from collections import defaultdict
-from import_graph import build_edges
+from functools import lru_cache
+from import_graph import build_edges, walk_py
 
 
-def print_tree(node, children, prefix="", last=True):
-    connector = "└─ " if last else "├─ "
-    print(prefix + connector + node)
+@lru_cache(maxsize=8)
+def _build_edges_cached(repo_str, file_states):
+    return tuple((src, frozenset(dsts)) for src, dsts in build_edges(Path(repo_str)).items())
 
-    new_prefix = prefix + ("   " if last else "│  ")
-    kids = sorted(children.get(node, []))
 
-    for i, k in enumerate(kids):
-        print_tree(k, children, new_prefix, i == len(kids) - 1)
+def cached_build_edges(repo):
+    """build_edges memoized on the repo path and the (path, mtime, size) of its .py files."""
+    repo_str = str(repo)
+    file_states = set()
+    for p in walk_py(repo_str):
+        st = os.stat(p)
+        file_states.add((p, st.st_mtime_ns, st.st_size))
+    frozen = _build_edges_cached(repo_str, frozenset(file_states))
+    return {src: set(dsts) for src, dsts in frozen}
+
+
+def print_tree(roots, children):
+    lines = []
+    stack = [(r, "", i == len(roots) - 1, frozenset()) for i, r in reversed(list(enumerate(roots)))]
+
+    while stack:
+        node, prefix, last, ancestors = stack.pop()
+        connector = "└─ " if last else "├─ "
+
+        # Import cycles: show the repeated node once and stop descending
+        if node in ancestors:
+            lines.append(prefix + connector + node + " (cycle)")
+            continue
+        lines.append(prefix + connector + node)
+
+        new_prefix = prefix + ("   " if last else "│  ")
+        new_ancestors = ancestors | {node}
+        kids = sorted(children.get(node, []))
+        for i, k in reversed(list(enumerate(kids))):
+            stack.append((k, new_prefix, i == len(kids) - 1, new_ancestors))
+
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
 
 
 def main():
@@ -21,7 +52,7 @@ def main():
         return
 
     repo = Path(sys.argv[1])
-    edges_dict = build_edges(repo)
+    edges_dict = cached_build_edges(repo)
     edges = [(a, b) for a, bs in edges_dict.items() for b in bs]
 
     children = defaultdict(list)
@@ -37,8 +68,7 @@ def main():
     roots = sorted(n for n in all_nodes if n not in imported)
 
     print("\nPROJECT TREE:")
-    for i, r in enumerate(roots):
-        print_tree(r, children, "", i == len(roots) - 1)
+    print_tree(roots, children)
 
     parents = {a for a, _ in edges}
     kids = {b for _, b in edges}